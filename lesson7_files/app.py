@@ -7,11 +7,30 @@ from plotly.subplots import make_subplots
 from datetime import datetime, date
 import warnings
 
-from data_loader import EcommerceDataLoader, load_and_process_data, categorize_delivery_speed
+from data_loader import EcommerceDataLoader, load_and_process_data, categorize_delivery_speed_series
 from business_metrics import BusinessMetricsCalculator
 
+# Optional numpy_groupies import for grouped sums over integer codes
+try:
+    import numpy_groupies as npg
+    HAS_NUMPY_GROUPIES = True
+except ImportError:
+    HAS_NUMPY_GROUPIES = False
+
+# Optional numba import for the fused KPI kernel
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 warnings.filterwarnings('ignore')
 
+DATA_PATH = 'ecommerce_data/'
+SNAPSHOT_PATH = 'ecommerce_data/parquet/'
+# Bump whenever the post-processing in load_data changes so stale snapshots are rebuilt
+SNAPSHOT_VERSION = '2'
+
 st.set_page_config(
     page_title="E-commerce Business Dashboard",
     page_icon="📊",
@@ -20,7 +39,7 @@ st.set_page_config(
 )
 
 # Custom CSS for professional styling
-st.markdown("""
+DASHBOARD_CSS = """
 <style>
     .main .block-container {
         padding-top: 2rem;
@@ -41,7 +60,8 @@ st.markdown("""
     }
     
     /* Chart containers */
-    .stPlotlyChart {
+    .stPlotlyChart,
+    div[data-testid="stImage"] {
         background-color: white;
         border: 1px solid #ddd;
         border-radius: 8px;
@@ -85,22 +105,297 @@ st.markdown("""
         padding: 0.5rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 @st.cache_data
 def load_data():
-    """Load and process the e-commerce data"""
-    loader, processed_data = load_and_process_data('ecommerce_data/')
+    """Load and process the e-commerce data, reusing the Parquet snapshot when current"""
+    loader = EcommerceDataLoader(DATA_PATH)
+    if loader.snapshot_is_current(SNAPSHOT_PATH, SNAPSHOT_VERSION):
+        return loader, loader.load_snapshot(SNAPSHOT_PATH)
+    
+    loader, processed_data = load_and_process_data(DATA_PATH)
+    
+    # Categorical grouping keys let groupby work on integer codes
+    processed_data['orders']['order_status'] = processed_data['orders']['order_status'].astype('category')
+    if 'products' in loader.raw_data:
+        products = loader.raw_data['products']
+        products['product_category_name'] = products['product_category_name'].astype('category')
+    if 'customers' in loader.raw_data:
+        customers = loader.raw_data['customers']
+        customers['customer_state'] = customers['customer_state'].astype('category')
+    
+    # Narrower numeric columns halve the memory scanned by every aggregation
+    processed_data['order_items']['price'] = processed_data['order_items']['price'].astype(np.float32)
+    if 'reviews' in loader.raw_data:
+        reviews = loader.raw_data['reviews']
+        reviews['review_score'] = reviews['review_score'].astype('Int8')
+    
+    loader.save_snapshot(SNAPSHOT_PATH, SNAPSHOT_VERSION)
     return loader, processed_data
 
 @st.cache_data
-def get_date_range(loader):
+def get_date_range(_loader):
     """Get the available date range from the data"""
-    orders = loader.processed_data['orders']
+    orders = _loader.processed_data['orders']
     min_date = orders['order_purchase_timestamp'].min().date()
     max_date = orders['order_purchase_timestamp'].max().date()
     return min_date, max_date
 
+def slice_by_date(df, start_date, end_date):
+    """Slice a frame sorted by purchase timestamp to an inclusive date range"""
+    timestamps = df['order_purchase_timestamp'].values
+    lo, hi = np.searchsorted(timestamps, [
+        np.datetime64(start_date),
+        np.datetime64(end_date) + np.timedelta64(1, 'D')
+    ])
+    return df.iloc[lo:hi]
+
+def shift_years(day, years):
+    """Shift a date by whole years, mapping Feb 29 to Feb 28 in non-leap years"""
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return day.replace(year=day.year + years, day=28)
+
+@st.cache_data
+def get_delivered_sales():
+    """Get the delivered sales dataset sorted by purchase time"""
+    loader, _ = load_data()
+    sales_data = loader.create_sales_dataset(status_filter='delivered')
+    sales_data = sales_data.sort_values('order_purchase_timestamp', kind='stable').reset_index(drop=True)
+    
+    # Integer order codes make distinct-order counts a plain ndarray operation
+    sales_data['order_code'] = pd.factorize(sales_data['order_id'])[0]
+    
+    if 'delivery_days' in sales_data.columns:
+        sales_data['delivery_days'] = sales_data['delivery_days'].astype('Int16')
+    
+    # Absolute month index (year * 12 + month - 1) for monthly aggregation
+    sales_data['month_code'] = (
+        sales_data['purchase_year'].values * 12 + sales_data['purchase_month'].values - 1
+    ).astype(np.int32)
+    return sales_data
+
+@st.cache_data
+def get_period_data(start_date, end_date):
+    """Get the delivered sales dataset restricted to a date range"""
+    return slice_by_date(get_delivered_sales(), start_date, end_date)
+
+def aggregate_sum(group_codes, values, size):
+    """Sum values per non-negative integer group code, skipping NaN values"""
+    if HAS_NUMPY_GROUPIES and len(group_codes) > 0:
+        return npg.aggregate(group_codes, values, func='nansum', size=size, dtype=np.float64)
+    valid = ~np.isnan(values)
+    return np.bincount(group_codes[valid], weights=values[valid], minlength=size)
+
+@st.cache_data
+def get_monthly_revenue(start_date, end_date):
+    """Get monthly revenue for a date range"""
+    period_data = get_period_data(start_date, end_date)
+    if len(period_data) == 0:
+        return pd.DataFrame({
+            'period': pd.Series(dtype=str),
+            'price': pd.Series(dtype=float)
+        })
+    
+    # Data is sorted by timestamp, so the first and last rows bound the month range
+    month_codes = period_data['month_code'].values
+    first_month = int(month_codes[0])
+    offsets = month_codes - first_month
+    n_months = int(offsets[-1]) + 1
+    
+    revenue = aggregate_sum(offsets, period_data['price'].values, n_months)
+    observed = np.bincount(offsets, minlength=n_months) > 0
+    
+    months = pd.period_range(
+        start=pd.Period(year=first_month // 12, month=first_month % 12 + 1, freq='M'),
+        periods=n_months,
+        freq='M'
+    )
+    return pd.DataFrame({
+        'period': months.astype(str)[observed],
+        'price': revenue[observed]
+    })
+
+@st.cache_data
+def get_category_revenue(start_date, end_date, top_n=10):
+    """Get the top categories by revenue for a date range"""
+    period_data = get_period_data(start_date, end_date)
+    if 'product_category_name' not in period_data.columns:
+        return None
+    
+    categories = period_data['product_category_name'].cat.categories
+    codes = period_data['product_category_name'].cat.codes.values.astype(np.int64)
+    known = codes >= 0
+    
+    revenue = aggregate_sum(codes[known], period_data['price'].values[known], len(categories))
+    observed = np.bincount(codes[known], minlength=len(categories)) > 0
+    
+    category_revenue = pd.Series(revenue[observed], index=categories[observed], name='price')
+    return category_revenue.sort_values(ascending=False).head(top_n)
+
+@st.cache_data
+def get_state_revenue_table():
+    """Get cumulative daily revenue and row counts per state over the delivered sales dataset"""
+    sales_data = get_delivered_sales()
+    if 'customer_state' not in sales_data.columns:
+        return None
+    
+    states = sales_data['customer_state'].cat.categories
+    state_codes = sales_data['customer_state'].cat.codes.values.astype(np.int64)
+    days = sales_data['order_purchase_timestamp'].values.astype('datetime64[D]')
+    
+    first_day = days[0] if len(days) > 0 else np.datetime64('1970-01-01')
+    day_codes = (days - first_day).astype(np.int64)
+    n_days = int(day_codes[-1]) + 1 if len(days) > 0 else 0
+    
+    # Aggregate once per (day, state), then prefix-sum over days so any range is two row lookups
+    known = state_codes >= 0
+    shape = (n_days, len(states))
+    group_codes = np.ravel_multi_index((day_codes[known], state_codes[known]), shape)
+    daily_revenue = aggregate_sum(group_codes, sales_data['price'].values[known], n_days * len(states)).reshape(shape)
+    daily_counts = np.bincount(group_codes, minlength=n_days * len(states)).reshape(shape)
+    
+    zeros = np.zeros((1, len(states)))
+    return {
+        'first_day': first_day,
+        'states': states,
+        'revenue': np.vstack([zeros, np.cumsum(daily_revenue, axis=0)]),
+        'counts': np.vstack([zeros, np.cumsum(daily_counts, axis=0)])
+    }
+
+def get_state_revenue(start_date, end_date):
+    """Get revenue by customer state for a date range from the precomputed state table"""
+    table = get_state_revenue_table()
+    if table is None:
+        return None
+    
+    n_days = len(table['revenue']) - 1
+    lo, hi = np.clip([
+        (np.datetime64(start_date) - table['first_day']).astype(np.int64),
+        (np.datetime64(end_date) - table['first_day']).astype(np.int64) + 1
+    ], 0, n_days)
+    lo = min(lo, hi)
+    
+    revenue = table['revenue'][hi] - table['revenue'][lo]
+    observed = table['counts'][hi] - table['counts'][lo] > 0
+    return pd.DataFrame({'state': table['states'][observed], 'revenue': revenue[observed]})
+
+@st.cache_data
+def get_delivery_satisfaction(start_date, end_date):
+    """Get the average review score per delivery time bucket for a date range"""
+    period_data = get_period_data(start_date, end_date)
+    
+    # Group directly on the bucket labels (already in display order) instead of adding a column
+    delivery_bucket = categorize_delivery_speed_series(period_data['delivery_days']).rename('delivery_bucket')
+    
+    satisfaction_delivery = period_data['review_score'].groupby(delivery_bucket, observed=True).mean().reset_index()
+    return satisfaction_delivery
+
+def _kpi_kernel(price, order_codes, delivery_days, review_scores, n_orders):
+    """Compute revenue, distinct orders and mean delivery/review in one pass"""
+    revenue = 0.0
+    delivery_total = 0.0
+    delivery_count = 0
+    review_total = 0.0
+    review_count = 0
+    seen = np.zeros(n_orders, dtype=np.bool_)
+    
+    for i in range(len(price)):
+        if not np.isnan(price[i]):
+            # Explicit cast keeps the float32 prices accumulating in float64 without numba too
+            revenue += np.float64(price[i])
+        seen[order_codes[i]] = True
+        if not np.isnan(delivery_days[i]):
+            delivery_total += delivery_days[i]
+            delivery_count += 1
+        if not np.isnan(review_scores[i]):
+            review_total += review_scores[i]
+            review_count += 1
+    
+    delivery_mean = delivery_total / delivery_count if delivery_count > 0 else np.nan
+    review_mean = review_total / review_count if review_count > 0 else np.nan
+    return revenue, seen.sum(), delivery_mean, review_mean
+
+def _kpi_numpy(price, order_codes, delivery_days, review_scores, n_orders):
+    """NumPy fallback for _kpi_kernel when numba is not installed"""
+    return (
+        np.nansum(price, dtype=np.float64),
+        np.unique(order_codes).size,
+        np.nanmean(delivery_days) if len(delivery_days) > 0 else np.nan,
+        np.nanmean(review_scores) if len(review_scores) > 0 else np.nan
+    )
+
+@st.cache_resource
+def get_kpi_kernel():
+    """Get the KPI reduction, compiled with numba when available"""
+    if HAS_NUMBA:
+        return njit(cache=True)(_kpi_kernel)
+    return _kpi_numpy
+
+def compute_kpis(df):
+    """Compute revenue, order count, average delivery days and review score for a slice"""
+    def float_column(col):
+        if col not in df.columns:
+            return np.full(len(df), np.nan)
+        return df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    order_codes = df['order_code'].values
+    n_orders = int(order_codes.max()) + 1 if len(order_codes) > 0 else 0
+    
+    revenue, orders, delivery_days, review_score = get_kpi_kernel()(
+        df['price'].values,
+        order_codes,
+        float_column('delivery_days'),
+        float_column('review_score'),
+        n_orders
+    )
+    return {
+        'revenue': float(revenue),
+        'orders': int(orders),
+        'delivery_days': float(delivery_days),
+        'review_score': float(review_score)
+    }
+
+def create_state_map(state_revenue):
+    """Create the US choropleth of revenue by state"""
+    fig_map = px.choropleth(
+        state_revenue,
+        locations='state',
+        color='revenue',
+        locationmode='USA-states',
+        scope='usa',
+        color_continuous_scale='Blues',
+        hover_data={'revenue': ':$,.0f'}
+    )
+    
+    fig_map.update_layout(
+        height=400,
+        geo=dict(bgcolor='rgba(0,0,0,0)'),
+        coloraxis_colorbar=dict(title="Revenue")
+    )
+    return fig_map
+
+@st.cache_resource
+def get_static_render_state():
+    """Get the process-wide flag recording whether static image export works"""
+    return {'available': True}
+
+@st.cache_data
+def render_state_map_png(state_revenue):
+    """Render the state choropleth to PNG bytes server-side, or None if kaleido or Chrome is unavailable"""
+    render_state = get_static_render_state()
+    if not render_state['available']:
+        return None
+    
+    try:
+        return create_state_map(state_revenue).to_image(format='png', width=800, height=400, scale=2)
+    except (ValueError, RuntimeError):
+        # Missing kaleido or browser will not fix itself, so stop retrying on every new range
+        render_state['available'] = False
+        return None
+
 def format_currency(value):
     """Format currency values with K/M suffixes"""
     if value >= 1000000:
@@ -110,11 +405,24 @@ def format_currency(value):
     else:
         return f"${value:.0f}"
 
-def calculate_trend_percentage(current_value, previous_value):
-    """Calculate percentage change between two values"""
-    if previous_value == 0:
-        return 0
-    return ((current_value - previous_value) / previous_value) * 100
+def format_currency_array(values):
+    """Vectorized format_currency for an array of values"""
+    values = np.asarray(values, dtype=np.float64)
+    millions = values >= 1000000
+    thousands = (values >= 1000) & ~millions
+    
+    scaled = np.where(millions, values / 1000000, np.where(thousands, values / 1000, values))
+    digits = np.where(millions, np.char.mod('%.1f', scaled), np.char.mod('%.0f', scaled))
+    suffix = np.select([millions, thousands], ['M', 'K'], '')
+    return np.char.add(np.char.add('$', digits), suffix)
+
+def calculate_trend_percentages(current_values, previous_values):
+    """Calculate percentage changes element-wise, returning 0 where the previous value is 0"""
+    current_values = np.asarray(current_values, dtype=np.float64)
+    previous_values = np.asarray(previous_values, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trends = (current_values - previous_values) / previous_values * 100
+    return np.where(previous_values == 0, 0.0, trends)
 
 def create_metric_card(title, value, delta=None, delta_color="normal"):
     """Create a metric card with optional trend indicator"""
@@ -127,7 +435,14 @@ def create_metric_card(title, value, delta=None, delta_color="normal"):
             delta_color=delta_color
         )
 
+def inject_css():
+    """Emit the dashboard stylesheet"""
+    # Streamlit drops elements that a rerun does not emit again, so this cannot be cached
+    st.markdown(DASHBOARD_CSS, unsafe_allow_html=True)
+
 def main():
+    inject_css()
+    
     # Load data
     loader, processed_data = load_data()
     min_date, max_date = get_date_range(loader)
@@ -153,56 +468,42 @@ def main():
     else:
         start_date = end_date = date_range if isinstance(date_range, date) else min_date
     
-    # Filter data based on selected date range
-    orders = loader.processed_data['orders']
-    filtered_orders = orders[
-        (orders['order_purchase_timestamp'].dt.date >= start_date) & 
-        (orders['order_purchase_timestamp'].dt.date <= end_date)
-    ]
-    
-    # Create filtered sales dataset
-    current_year = start_date.year
-    previous_year = current_year - 1
-    
-    # Get data for current and previous periods
-    current_data = loader.create_sales_dataset(
-        year_filter=current_year,
-        status_filter='delivered'
-    )
-    
-    previous_data = loader.create_sales_dataset(
-        year_filter=previous_year,
-        status_filter='delivered'
-    )
-    
-    # Apply date filtering to current data
-    current_data = current_data[
-        (current_data['order_purchase_timestamp'].dt.date >= start_date) & 
-        (current_data['order_purchase_timestamp'].dt.date <= end_date)
-    ]
-    
     # Calculate previous period for comparison (same date range, previous year)
-    prev_start = date(previous_year, start_date.month, start_date.day)
-    prev_end = date(previous_year, end_date.month, end_date.day)
+    prev_start = shift_years(start_date, -1)
+    prev_end = shift_years(end_date, -1)
     
-    previous_data = previous_data[
-        (previous_data['order_purchase_timestamp'].dt.date >= prev_start) & 
-        (previous_data['order_purchase_timestamp'].dt.date <= prev_end)
-    ]
+    # Get data for current and previous periods as slices of the sorted delivered dataset
+    current_data = get_period_data(start_date, end_date)
+    previous_data = get_period_data(prev_start, prev_end)
     
     # Calculate KPIs
-    current_revenue = current_data['price'].sum()
-    current_orders = current_data['order_id'].nunique()
+    current_kpis = compute_kpis(current_data)
+    previous_kpis = compute_kpis(previous_data)
+    
+    current_revenue = current_kpis['revenue']
+    current_orders = current_kpis['orders']
     current_aov = current_revenue / current_orders if current_orders > 0 else 0
     
-    previous_revenue = previous_data['price'].sum() if len(previous_data) > 0 else 0
-    previous_orders = previous_data['order_id'].nunique() if len(previous_data) > 0 else 0
+    previous_revenue = previous_kpis['revenue']
+    previous_orders = previous_kpis['orders']
     previous_aov = previous_revenue / previous_orders if previous_orders > 0 else 0
     
-    # Calculate trends
-    revenue_trend = calculate_trend_percentage(current_revenue, previous_revenue)
-    aov_trend = calculate_trend_percentage(current_aov, previous_aov)
-    orders_trend = calculate_trend_percentage(current_orders, previous_orders)
+    current_delivery = current_kpis['delivery_days']
+    previous_delivery = previous_kpis['delivery_days'] if len(previous_data) > 0 and 'delivery_days' in previous_data.columns else current_delivery
+    
+    # Calculate trends for revenue, AOV, orders and delivery time in one pass
+    trends = calculate_trend_percentages(
+        [current_revenue, current_aov, current_orders, current_delivery],
+        [previous_revenue, previous_aov, previous_orders, previous_delivery]
+    )
+    
+    # Longer delivery is bad, so a rising delivery trend is colored as a decline
+    higher_is_better = np.array([True, True, True, False])
+    is_improvement = np.where(higher_is_better, trends >= 0, ~(trends > 0))
+    delta_colors = np.where(is_improvement, "normal", "inverse")
+    
+    revenue_trend, aov_trend, orders_trend, delivery_trend = trends
+    revenue_color, aov_color, orders_color, delivery_color = delta_colors.tolist()
     
     # KPI Row
     st.subheader("")
@@ -213,7 +514,7 @@ def main():
             "Total Revenue", 
             format_currency(current_revenue),
             revenue_trend,
-            "normal" if revenue_trend >= 0 else "inverse"
+            revenue_color
         )
     
     with kpi_col2:
@@ -228,7 +529,7 @@ def main():
             "Average Order Value",
             format_currency(current_aov),
             aov_trend,
-            "normal" if aov_trend >= 0 else "inverse"
+            aov_color
         )
     
     with kpi_col4:
@@ -236,11 +537,14 @@ def main():
             "Total Orders",
             f"{current_orders:,}",
             orders_trend,
-            "normal" if orders_trend >= 0 else "inverse"
+            orders_color
         )
     
     st.divider()
     
+    category_revenue = get_category_revenue(start_date, end_date)
+    state_revenue = get_state_revenue(start_date, end_date)
+    
     # Charts Grid (2x2 layout)
     chart_col1, chart_col2 = st.columns(2)
     
@@ -249,23 +553,14 @@ def main():
         st.subheader("Revenue Trend")
         
         # Prepare monthly revenue data
-        current_monthly = current_data.groupby(
-            current_data['order_purchase_timestamp'].dt.to_period('M')
-        )['price'].sum().reset_index()
-        current_monthly['period'] = current_monthly['order_purchase_timestamp'].astype(str)
-        current_monthly['type'] = 'Current Period'
-        
-        previous_monthly = previous_data.groupby(
-            previous_data['order_purchase_timestamp'].dt.to_period('M')
-        )['price'].sum().reset_index()
-        previous_monthly['period'] = previous_monthly['order_purchase_timestamp'].astype(str)
-        previous_monthly['type'] = 'Previous Period'
+        current_monthly = get_monthly_revenue(start_date, end_date)
+        previous_monthly = get_monthly_revenue(prev_start, prev_end)
         
         # Create revenue trend chart
         fig_revenue = go.Figure()
         
         if len(current_monthly) > 0:
-            fig_revenue.add_trace(go.Scatter(
+            fig_revenue.add_trace(go.Scattergl(
                 x=current_monthly['period'],
                 y=current_monthly['price'],
                 mode='lines+markers',
@@ -274,7 +569,7 @@ def main():
             ))
         
         if len(previous_monthly) > 0:
-            fig_revenue.add_trace(go.Scatter(
+            fig_revenue.add_trace(go.Scattergl(
                 x=previous_monthly['period'],
                 y=previous_monthly['price'],
                 mode='lines+markers',
@@ -301,30 +596,30 @@ def main():
         # Top 10 categories bar chart
         st.subheader("Top Categories")
         
-        if 'product_category_name' in current_data.columns:
-            category_revenue = current_data.groupby('product_category_name')['price'].sum().sort_values(ascending=False).head(10)
-            
-            fig_categories = px.bar(
+        if category_revenue is not None:
+            fig_categories = go.Figure(go.Bar(
                 x=category_revenue.values,
-                y=category_revenue.index,
+                y=category_revenue.index.astype(str),
                 orientation='h',
-                color=category_revenue.values,
-                color_continuous_scale='Blues',
-                text=[format_currency(x) for x in category_revenue.values]
-            )
+                marker=dict(color=category_revenue.values, colorscale='Blues'),
+                text=format_currency_array(category_revenue.values),
+                textposition='outside'
+            ))
             
             fig_categories.update_layout(
                 height=400,
+                template='plotly_white',
                 xaxis_title="Revenue",
                 yaxis_title="Category",
                 showlegend=False,
-                coloraxis_showscale=False,
                 yaxis={'categoryorder':'total ascending'}
             )
             
-            fig_categories.update_traces(textposition='outside')
-            
-            st.plotly_chart(fig_categories, use_container_width=True)
+            st.plotly_chart(
+                fig_categories,
+                use_container_width=True,
+                config={'staticPlot': False, 'plotGlPixelRatio': 2}
+            )
         else:
             st.info("Category data not available")
     
@@ -335,27 +630,13 @@ def main():
         # US choropleth map
         st.subheader("Revenue by State")
         
-        if 'customer_state' in current_data.columns:
-            state_revenue = current_data.groupby('customer_state')['price'].sum().reset_index()
-            state_revenue.columns = ['state', 'revenue']
+        if state_revenue is not None:
+            map_image = render_state_map_png(state_revenue)
             
-            fig_map = px.choropleth(
-                state_revenue,
-                locations='state',
-                color='revenue',
-                locationmode='USA-states',
-                scope='usa',
-                color_continuous_scale='Blues',
-                hover_data={'revenue': ':$,.0f'}
-            )
-            
-            fig_map.update_layout(
-                height=400,
-                geo=dict(bgcolor='rgba(0,0,0,0)'),
-                coloraxis_colorbar=dict(title="Revenue")
-            )
-            
-            st.plotly_chart(fig_map, use_container_width=True)
+            if map_image is not None:
+                st.image(map_image, use_container_width=True)
+            else:
+                st.plotly_chart(create_state_map(state_revenue), use_container_width=True)
         else:
             st.info("State data not available")
     
@@ -364,28 +645,14 @@ def main():
         st.subheader("Satisfaction vs Delivery Time")
         
         if 'delivery_days' in current_data.columns and 'review_score' in current_data.columns:
-            # Create delivery time buckets
-            current_data_copy = current_data.copy()
-            current_data_copy['delivery_bucket'] = current_data_copy['delivery_days'].apply(categorize_delivery_speed)
-            
-            satisfaction_delivery = current_data_copy.groupby('delivery_bucket')['review_score'].mean().reset_index()
-            
-            # Define bucket order
-            bucket_order = ['1-3 days', '4-7 days', '8+ days', 'Unknown']
-            satisfaction_delivery['delivery_bucket'] = pd.Categorical(
-                satisfaction_delivery['delivery_bucket'], 
-                categories=bucket_order, 
-                ordered=True
-            )
-            satisfaction_delivery = satisfaction_delivery.sort_values('delivery_bucket')
+            satisfaction_delivery = get_delivery_satisfaction(start_date, end_date)
             
             fig_satisfaction = px.bar(
                 satisfaction_delivery,
                 x='delivery_bucket',
                 y='review_score',
                 color='review_score',
-                color_continuous_scale='Blues',
-                text=[f"{x:.1f}" for x in satisfaction_delivery['review_score']]
+                color_continuous_scale='Blues'
             )
             
             fig_satisfaction.update_layout(
@@ -397,7 +664,7 @@ def main():
                 yaxis=dict(range=[0, 5])
             )
             
-            fig_satisfaction.update_traces(textposition='outside')
+            fig_satisfaction.update_traces(texttemplate='%{y:.1f}', textposition='outside')
             
             st.plotly_chart(fig_satisfaction, use_container_width=True)
         else:
@@ -411,21 +678,17 @@ def main():
     with bottom_col1:
         # Average delivery time with trend
         if 'delivery_days' in current_data.columns:
-            current_delivery = current_data['delivery_days'].mean()
-            previous_delivery = previous_data['delivery_days'].mean() if len(previous_data) > 0 and 'delivery_days' in previous_data.columns else current_delivery
-            delivery_trend = calculate_trend_percentage(current_delivery, previous_delivery)
-            
             st.metric(
                 "Average Delivery Time",
                 f"{current_delivery:.1f} days",
                 f"{delivery_trend:+.2f}%",
-                delta_color="inverse" if delivery_trend > 0 else "normal"  # Longer delivery is bad
+                delta_color=delivery_color
             )
     
     with bottom_col2:
         # Review score with stars
         if 'review_score' in current_data.columns:
-            avg_review = current_data['review_score'].mean()
+            avg_review = current_kpis['review_score']
             stars = "⭐" * int(round(avg_review))
             
             st.metric(
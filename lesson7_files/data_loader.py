@@ -2,11 +2,20 @@
 Data loading and processing module for e-commerce data analysis.
 """
 
+import os
+import shutil
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import warnings
 
+# Optional pyarrow import for Parquet snapshots
+try:
+    import pyarrow
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
 warnings.filterwarnings('ignore')
 
 
@@ -15,6 +24,17 @@ class EcommerceDataLoader:
     A class for loading and processing e-commerce data.
     """
     
+    FILE_MAPPINGS = {
+        'orders': 'orders_dataset.csv',
+        'order_items': 'order_items_dataset.csv',
+        'products': 'products_dataset.csv',
+        'customers': 'customers_dataset.csv',
+        'reviews': 'order_reviews_dataset.csv',
+        'payments': 'order_payments_dataset.csv'
+    }
+    
+    SNAPSHOT_VERSION_FILE = 'VERSION'
+    
     def __init__(self, data_path: str = 'ecommerce_data/'):
         """
         Initialize the data loader.
@@ -33,16 +53,7 @@ class EcommerceDataLoader:
         Returns:
             Dict[str, pd.DataFrame]: Dictionary containing all raw datasets
         """
-        file_mappings = {
-            'orders': 'orders_dataset.csv',
-            'order_items': 'order_items_dataset.csv',
-            'products': 'products_dataset.csv',
-            'customers': 'customers_dataset.csv',
-            'reviews': 'order_reviews_dataset.csv',
-            'payments': 'order_payments_dataset.csv'
-        }
-        
-        for key, filename in file_mappings.items():
+        for key, filename in self.FILE_MAPPINGS.items():
             try:
                 self.raw_data[key] = pd.read_csv(f"{self.data_path}{filename}")
                 print(f"Loaded {key}: {len(self.raw_data[key])} records")
@@ -204,6 +215,121 @@ class EcommerceDataLoader:
         
         return self.processed_data
     
+    def expected_snapshot_files(self) -> List[str]:
+        """
+        List the snapshot files a complete snapshot of the current CSV sources contains.
+        
+        Returns:
+            List[str]: Parquet file names for every raw and processed dataset
+        """
+        available = [
+            key for key, filename in self.FILE_MAPPINGS.items()
+            if os.path.exists(f"{self.data_path}{filename}")
+        ]
+        
+        # Mirrors process_all_data: orders and order items always, reviews when present
+        processed = ['orders', 'order_items'] + (['reviews'] if 'reviews' in available else [])
+        return [f"raw_{key}.parquet" for key in available] + [f"processed_{key}.parquet" for key in processed]
+    
+    def snapshot_is_current(self, snapshot_path: str, version: str) -> bool:
+        """
+        Check whether a complete Parquet snapshot exists, matches the expected
+        format version and is newer than the CSV sources.
+        
+        Args:
+            snapshot_path (str): Directory holding the snapshot files
+            version (str): Format version the snapshot must have been written with
+        
+        Returns:
+            bool: True if the snapshot can be used instead of the CSV files
+        """
+        if not HAS_PYARROW or not os.path.isdir(snapshot_path):
+            return False
+        
+        expected_files = self.expected_snapshot_files()
+        snapshot_files = [os.path.join(snapshot_path, f) for f in expected_files]
+        if not expected_files or not all(os.path.exists(f) for f in snapshot_files):
+            return False
+        
+        try:
+            with open(os.path.join(snapshot_path, self.SNAPSHOT_VERSION_FILE)) as f:
+                if f.read().strip() != version:
+                    return False
+        except OSError:
+            return False
+        
+        csv_files = [f"{self.data_path}{filename}" for filename in self.FILE_MAPPINGS.values()]
+        newest_source = max((os.path.getmtime(f) for f in csv_files if os.path.exists(f)), default=0)
+        return min(os.path.getmtime(f) for f in snapshot_files) >= newest_source
+    
+    def save_snapshot(self, snapshot_path: str, version: str) -> None:
+        """
+        Write all raw and processed datasets to Parquet files.
+        
+        Strings are dictionary-encoded and pages are LZ4-compressed, and the
+        current column dtypes (categories, downcast numerics) are preserved.
+        Files are written to a temporary directory that is renamed into place,
+        so a failed write never leaves a partial snapshot behind. Write
+        failures, including pyarrow conversion errors, are reported and skipped.
+        
+        Args:
+            snapshot_path (str): Directory to write the snapshot files to
+            version (str): Format version recorded alongside the snapshot files
+        """
+        if not HAS_PYARROW:
+            print("Warning: pyarrow not installed, skipping Parquet snapshot...")
+            return
+        
+        snapshot_path = snapshot_path.rstrip('/')
+        temp_path = f"{snapshot_path}.tmp"
+        
+        try:
+            shutil.rmtree(temp_path, ignore_errors=True)
+            os.makedirs(temp_path)
+            for stage, datasets in (('raw', self.raw_data), ('processed', self.processed_data)):
+                for name, df in datasets.items():
+                    df.to_parquet(
+                        os.path.join(temp_path, f"{stage}_{name}.parquet"),
+                        index=False,
+                        compression='lz4',
+                        use_dictionary=True
+                    )
+            with open(os.path.join(temp_path, self.SNAPSHOT_VERSION_FILE), 'w') as f:
+                f.write(version)
+            
+            if os.path.isdir(snapshot_path):
+                shutil.rmtree(snapshot_path)
+            os.replace(temp_path, snapshot_path)
+        except (OSError, ValueError, TypeError) as e:
+            # pyarrow raises ArrowInvalid (ValueError) or ArrowTypeError (TypeError) on mixed-type columns
+            shutil.rmtree(temp_path, ignore_errors=True)
+            print(f"Warning: could not write Parquet snapshot ({e}), skipping...")
+    
+    def load_snapshot(self, snapshot_path: str) -> Dict[str, pd.DataFrame]:
+        """
+        Load raw and processed datasets from a Parquet snapshot.
+        
+        Args:
+            snapshot_path (str): Directory holding the snapshot files
+        
+        Returns:
+            Dict[str, pd.DataFrame]: Dictionary containing all processed datasets
+        """
+        for filename in sorted(os.listdir(snapshot_path)):
+            if not filename.endswith('.parquet'):
+                continue
+            
+            stage, name = filename[:-len('.parquet')].split('_', 1)
+            df = pd.read_parquet(os.path.join(snapshot_path, filename), memory_map=True, use_threads=True)
+            
+            if stage == 'raw':
+                self.raw_data[name] = df
+                print(f"Loaded {name} snapshot: {len(df)} records")
+            else:
+                self.processed_data[name] = df
+        
+        return self.processed_data
+    
     def get_data_summary(self) -> Dict[str, Dict]:
         """
         Get summary statistics for all datasets.
@@ -251,6 +377,26 @@ def categorize_delivery_speed(days: float) -> str:
         return '8+ days'
 
 
+def categorize_delivery_speed_series(days: pd.Series) -> pd.Series:
+    """
+    Categorize a whole column of delivery days at once.
+    
+    Vectorized equivalent of categorize_delivery_speed using pd.cut.
+    
+    Args:
+        days (pd.Series): Number of delivery days per row
+    
+    Returns:
+        pd.Series: Categorical delivery speed labels, ordered from fastest to 'Unknown'
+    """
+    buckets = pd.cut(
+        days,
+        bins=[-np.inf, 3, 7, np.inf],
+        labels=['1-3 days', '4-7 days', '8+ days']
+    )
+    return buckets.cat.add_categories(['Unknown']).fillna('Unknown')
+
+
 def load_and_process_data(data_path: str = 'ecommerce_data/') -> Tuple[EcommerceDataLoader, Dict[str, pd.DataFrame]]:
     """
     Convenience function to load and process all data.